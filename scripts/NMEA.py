@@ -4,14 +4,153 @@ Original File: https://github.com/inmcm/micropyGPS/blob/master/micropyGPS.py
 Used under MIT License
 """
 
+import sys
+
+if sys.implementation.name == "micropython":
+    import micropython
+
+    # Compiles the per byte parser methods to machine code instead of bytecode
+    _native = micropython.native
+
+    @micropython.viper
+    def _xor_bytes(buf: ptr8, start: int, stop: int, crc: int) -> int:
+        # XOR buf[start:stop] into crc using machine ints
+        for i in range(start, stop):
+            crc ^= buf[i]
+        return crc
+
+    @micropython.viper
+    def _find_byte(buf: ptr8, start: int, stop: int, char: int) -> int:
+        # Index of the first char in buf[start:stop], -1 if there is none. Works on bytearray, which has no find()
+        i = start
+        while i < stop:
+            if buf[i] == char:
+                return i
+            i += 1
+        return -1
+
+    @micropython.viper
+    def _find_delimiter(buf: ptr8, start: int, stop: int) -> int:
+        # Index of the first '$', ',' or '*' in buf[start:stop], stop if there is none
+        i = start
+        while i < stop:
+            char = buf[i]
+            if char == 0x24 or char == 0x2C or char == 0x2A:
+                return i
+            i += 1
+        return stop
+
+else:
+
+    def _native(function):
+        """No native emitter outside MicroPython, run the function as is"""
+        return function
+
+    def _xor_bytes(buf, start: int, stop: int, crc: int) -> int:
+        """XOR buf[start:stop] into crc"""
+        for ascii_char in buf[start:stop]:
+            crc ^= ascii_char
+        return crc
+
+    def _find_byte(buf, start: int, stop: int, char: int) -> int:
+        """Index of the first char in buf[start:stop], -1 if there is none"""
+        return buf.find(bytes((char,)), start, stop)
+
+    def _find_delimiter(buf, start: int, stop: int) -> int:
+        """Index of the first '$', ',' or '*' in buf[start:stop], stop if there is none"""
+        for delimiter in (b"$", b",", b"*"):
+            index = buf.find(delimiter, start, stop)
+            if index >= 0:
+                stop = index
+        return stop
+
+
+def _parse_coord(segment: bytes, degree_digits: int) -> float:
+    """Convert a (d)ddmm.mmmm coordinate segment to decimal degrees in a single pass over its digits, without
+    slicing it or calling float(). Raises ValueError if the segment is malformed"""
+
+    degrees = 0
+    minutes = 0
+    minute_digits = 0
+    decimals = -1  # Digits seen after the decimal point, -1 until the point is found
+
+    for index, char in enumerate(segment):
+        digit = char - 48
+
+        if 0 <= digit <= 9:
+            if index < degree_digits:
+                degrees = degrees * 10 + digit
+            else:
+                minutes = minutes * 10 + digit
+                minute_digits += 1
+                if decimals >= 0:
+                    decimals += 1
+
+        elif char == 0x2E and index >= degree_digits and decimals < 0:
+            decimals = 0
+
+        else:
+            raise ValueError(f"Bad coordinate: {segment.decode()}")
+
+    if not minute_digits:
+        raise ValueError(f"Bad coordinate: {segment.decode()}")
+
+    if decimals > 0:
+        return degrees + minutes / 10**decimals / 60
+
+    return degrees + minutes / 60
+
+
+# What update() does with each ASCII char: store it, end a segment (,), end the sentence data and start the CRC (*),
+# start a new sentence ($) or ignore it if not printable
+_DATA, _SEGMENT, _CRC, _START, _IGNORE = 0, 1, 2, 3, 4
+_DISPATCH = bytearray(128)
+for _char in range(10):
+    _DISPATCH[_char] = _IGNORE
+_DISPATCH[127] = _IGNORE
+_DISPATCH[ord(",")] = _SEGMENT
+_DISPATCH[ord("*")] = _CRC
+_DISPATCH[ord("$")] = _START
+
+# Value of each ASCII hex digit, 0xFF for every other byte
+_HEX = bytearray(b"\xff" * 256)
+for _char in range(10):
+    _HEX[ord("0") + _char] = _char
+for _char in range(6):
+    _HEX[ord("A") + _char] = _HEX[ord("a") + _char] = 10 + _char
+
+
+def _parse_crc(high: int, low: int) -> int:
+    """Value of the two CRC hex digit chars, -1 if either of them isn't a hex digit"""
+    high = _HEX[high]
+    low = _HEX[low]
+    if high > 15 or low > 15:
+        return -1
+    return high << 4 | low
+
 
 class NMEAparser(object):
     """GPS NMEA Sentence Parser. Creates object that stores all relevant GPS data and statistics.
-    Parses sentences one character at a time using update()."""
+    Parses sentences one character at a time using update(), or a whole chunk of bytes at a time using
+    update_bytes()."""
+
+    __slots__ = (
+        "sentence_active",
+        "active_segment",
+        "process_crc",
+        "gps_segments",
+        "segment",
+        "crc_xor",
+        "char_count",
+        "utc_time",
+        "lat",
+        "lng",
+        "valid",
+    )
 
     # Max Number of Characters a valid sentence can be (based on GGA sentence)
     __NMEA_MAX_CHAR_COUNT = 90
-    __HEMISPHERES = ("N", "S", "E", "W")
+    __HEMISPHERES = frozenset((b"N", b"S", b"E", b"W"))
 
     def __init__(self):
         #####################
@@ -19,7 +158,8 @@ class NMEAparser(object):
         self.sentence_active: bool = False
         self.active_segment: int = 0
         self.process_crc: bool = False
-        self.gps_segments: list[str] = []
+        self.gps_segments: list[bytes] = []
+        self.segment: bytearray = bytearray()
         self.crc_xor: int = 0
         self.char_count: int = 0
 
@@ -47,7 +187,7 @@ class NMEAparser(object):
             return False
 
         # Check Receiver Data Valid Flag
-        if self.gps_segments[2] == "A":  # Data from Receiver is Valid/Has Fix
+        if self.gps_segments[2] == b"A":  # Data from Receiver is Valid/Has Fix
             if self.gps_segments[4] not in self.__HEMISPHERES:
                 return False
 
@@ -57,16 +197,14 @@ class NMEAparser(object):
             # Longitude / Latitude
             try:
                 # Latitude
-                self.lat = (
-                    int(self.gps_segments[3][0:2])
-                    + (float(self.gps_segments[3][2:]) / 60)
-                ) * (1 if self.gps_segments[4] == "N" else -1)
+                self.lat = _parse_coord(self.gps_segments[3], 2) * (
+                    1 if self.gps_segments[4] == b"N" else -1
+                )
 
                 # Longitude
-                self.lng = (
-                    int(self.gps_segments[5][0:3])
-                    + (float(self.gps_segments[5][3:]) / 60)
-                ) * (1 if self.gps_segments[6] == "E" else -1)
+                self.lng = _parse_coord(self.gps_segments[5], 3) * (
+                    1 if self.gps_segments[6] == b"E" else -1
+                )
             except ValueError:
                 return False
 
@@ -92,7 +230,7 @@ class NMEAparser(object):
             return False
 
         # Check Receiver Data Valid Flag
-        if self.gps_segments[6] == "A":  # Data from Receiver is Valid/Has Fix
+        if self.gps_segments[6] == b"A":  # Data from Receiver is Valid/Has Fix
             if self.gps_segments[2] not in self.__HEMISPHERES:
                 return False
 
@@ -102,16 +240,14 @@ class NMEAparser(object):
             # Longitude / Latitude
             try:
                 # Latitude
-                self.lat = (
-                    int(self.gps_segments[1][0:2])
-                    + (float(self.gps_segments[1][2:]) / 60)
-                ) * (1 if self.gps_segments[2] == "N" else -1)
+                self.lat = _parse_coord(self.gps_segments[1], 2) * (
+                    1 if self.gps_segments[2] == b"N" else -1
+                )
 
                 # Longitude
-                self.lng = (
-                    int(self.gps_segments[3][0:3])
-                    + (float(self.gps_segments[3][3:]) / 60)
-                ) * (1 if self.gps_segments[4] == "E" else -1)
+                self.lng = _parse_coord(self.gps_segments[3], 3) * (
+                    1 if self.gps_segments[4] == b"E" else -1
+                )
             except ValueError:
                 return False
 
@@ -151,16 +287,14 @@ class NMEAparser(object):
             # Longitude / Latitude
             try:
                 # Latitude
-                self.lat = (
-                    int(self.gps_segments[2][0:2])
-                    + (float(self.gps_segments[2][2:]) / 60)
-                ) * (1 if self.gps_segments[3] == "N" else -1)
+                self.lat = _parse_coord(self.gps_segments[2], 2) * (
+                    1 if self.gps_segments[3] == b"N" else -1
+                )
 
                 # Longitude
-                self.lng = (
-                    int(self.gps_segments[4][0:3])
-                    + (float(self.gps_segments[4][3:]) / 60)
-                ) * (1 if self.gps_segments[5] == "E" else -1)
+                self.lng = _parse_coord(self.gps_segments[4], 3) * (
+                    1 if self.gps_segments[5] == b"E" else -1
+                )
             except ValueError:
                 return False
 
@@ -172,7 +306,8 @@ class NMEAparser(object):
 
     def new_sentence(self) -> None:
         """Adjust Object Flags in Preparation for a New Sentence"""
-        self.gps_segments = [""]
+        self.gps_segments = []
+        self.segment = bytearray()
         self.active_segment = 0
         self.crc_xor = 0
         self.sentence_active = True
@@ -184,62 +319,64 @@ class NMEAparser(object):
         Function builds a list of received string that are validate by CRC prior to parsing by the  appropriate
         sentence function. Returns sentence type on successful parse, None otherwise"""
 
+        return self.update_byte(ord(new_char))
+
+    @_native
+    def update_byte(self, ascii_char: int) -> bool:
+        """Same as update() for a byte given as an int, like the items of the bytes read from the UART. Saves
+        the one char string and the ord() call per byte"""
+
         valid_sentence = False
 
-        # Validate new_char is a printable char
-        ascii_char = ord(new_char)
+        # Look up what the char means, anything that isn't printable is ignored
+        op = _DISPATCH[ascii_char] if ascii_char < 128 else _IGNORE
 
-        if 10 <= ascii_char <= 126:
+        if op != _IGNORE:
             self.char_count += 1
 
             # Check if a new string is starting ($)
-            if new_char == "$":
+            if op == _START:
                 self.new_sentence()
                 return False
 
             elif self.sentence_active:
-                # Check if sentence is ending (*)
-                if new_char == "*":
-                    self.process_crc = False
-                    self.active_segment += 1
-                    self.gps_segments.append("")
-                    return False
-
-                # Check if a section is ended (,), Create a new substring to feed
-                # characters to
-                elif new_char == ",":
-                    self.active_segment += 1
-                    self.gps_segments.append("")
+                segment = self.segment
+                process_crc = self.process_crc
 
                 # Store All Other printable character and check CRC when ready
-                else:
-                    self.gps_segments[self.active_segment] += new_char
+                if op == _DATA:
+                    segment.append(ascii_char)
 
                     # When CRC input is disabled, sentence is nearly complete
-                    if not self.process_crc:
-                        if len(self.gps_segments[self.active_segment]) == 2:
-                            try:
-                                final_crc = int(
-                                    self.gps_segments[self.active_segment], 16
-                                )
-                                if self.crc_xor == final_crc:
-                                    valid_sentence = True
-                            except ValueError:
-                                pass  # CRC Value was deformed and could not have been correct
+                    if not process_crc:
+                        if len(segment) == 2:
+                            # A deformed CRC value is -1 and can't match
+                            if self.crc_xor == _parse_crc(segment[0], segment[1]):
+                                valid_sentence = True
+
+                # Check if a section is ended (,) or the sentence is ending (*), Create a new substring to feed
+                # characters to
+                else:
+                    self.active_segment += 1
+                    self.gps_segments.append(bytes(segment))
+                    self.segment = bytearray()
+
+                    if op == _CRC:
+                        self.process_crc = False
+                        return False
 
                 # Update CRC
-                if self.process_crc:
+                if process_crc:
                     self.crc_xor ^= ascii_char
 
                 # If a Valid Sentence Was received and it's a supported sentence, then parse it!!
                 if valid_sentence:
                     self.sentence_active = False  # Clear Active Processing Flag
 
-                    if self.gps_segments[0] in self.supported_sentences:
-                        # parse the Sentence Based on the message type, return True if parse is clean
-                        if self.supported_sentences[self.gps_segments[0]](self):
-                            # Let host know that the GPS object was updated by returning parsed sentence type
-                            return True
+                    # parse the Sentence Based on the message type, return True if parse is clean
+                    if self.dispatch_sentence():
+                        # Let host know that the GPS object was updated by returning parsed sentence type
+                        return True
 
                 # Check that the sentence buffer isn't filling up with Garage waiting for the sentence to complete
                 if self.char_count > self.__NMEA_MAX_CHAR_COUNT:
@@ -248,11 +385,151 @@ class NMEAparser(object):
         # Tell Host no new sentence was parsed
         return False
 
+    @_native
+    def update_bytes(self, buf: bytes | bytearray, end: int = -1) -> bool:
+        """Process a chunk of raw bytes (as read from the UART) with the same semantics as feeding each char to
+        update(). Delimiters are located with _find_byte and the data between them is added a whole segment
+        at a time instead of one char per call. Only buf[:end] is used when end is given, so a reused read
+        buffer can be passed as is. Returns True if any sentence in the chunk was parsed
+        """
+
+        updated = False
+        start = 0
+        if end < 0:
+            end = len(buf)
+
+        while start < end:
+            # Skip everything up to the start of the next sentence ($)
+            if not self.sentence_active:
+                start = _find_byte(buf, start, end, 0x24)  # $
+                if start < 0:
+                    break
+
+                # Whole line already in the chunk, parse it in one go unless it is malformed enough ('$' inside
+                # the line or delimiters after the '*') to need the char by char handling below
+                line_end = _find_byte(buf, start, end, 0x0A)  # \n
+                crc_start = _find_byte(buf, start, line_end, 0x2A)  # *
+                if (
+                    line_end >= 0
+                    and crc_start >= 0
+                    and _find_byte(buf, start + 1, line_end, 0x24) < 0  # $
+                    and _find_byte(buf, crc_start, line_end, 0x2C) < 0  # ,
+                    and _find_byte(buf, crc_start + 1, line_end, 0x2A) < 0  # *
+                ):
+                    self.sentence_active = True
+                    if self.parse_sentence(bytes(buf[start:line_end])):
+                        updated = True
+
+                    # A bad CRC leaves the sentence open in update(), so only skip the line if it was accepted
+                    if not self.sentence_active:
+                        start = line_end + 1
+                        continue
+
+                self.new_sentence()
+                start += 1
+                continue
+
+            # Find the next special character, only the two CRC chars are needed once CRC input is disabled
+            if self.process_crc or len(self.segment) >= 2:
+                stop = end
+            else:
+                stop = min(end, start + 2 - len(self.segment))
+            stop = _find_delimiter(buf, start, stop)
+
+            # Store the data between delimiters and update CRC
+            if stop > start:
+                self.segment += buf[start:stop]
+                self.char_count += stop - start
+                if self.process_crc:
+                    self.crc_xor = _xor_bytes(buf, start, stop, self.crc_xor)
+
+                # When CRC input is disabled, sentence is complete once two CRC chars matching the CRC are in
+                elif len(self.segment) == 2:
+                    # A deformed CRC value is -1 and can't match
+                    final_crc = _parse_crc(self.segment[0], self.segment[1])
+
+                    # The char limit applies up to the first CRC char, like in update()
+                    if (
+                        self.crc_xor == final_crc
+                        and self.char_count - 1 <= self.__NMEA_MAX_CHAR_COUNT
+                    ):
+                        self.sentence_active = False
+
+                        if self.dispatch_sentence():
+                            updated = True
+
+                # Check that the sentence buffer isn't filling up with Garage waiting for the sentence to complete
+                if self.char_count > self.__NMEA_MAX_CHAR_COUNT:
+                    self.sentence_active = False
+
+                start = stop
+                continue
+
+            # Handle the special character at buf[start]
+            delimiter = buf[start]
+            start += 1
+
+            if delimiter == 0x24:  # $
+                self.new_sentence()
+                continue
+
+            self.char_count += 1
+            self.active_segment += 1
+            self.gps_segments.append(bytes(self.segment))
+            self.segment = bytearray()
+
+            if delimiter == 0x2A:  # *
+                self.process_crc = False
+            elif self.process_crc:  # ,
+                self.crc_xor ^= delimiter
+
+            if self.char_count > self.__NMEA_MAX_CHAR_COUNT:
+                self.sentence_active = False
+
+        return updated
+
+    @_native
+    def parse_sentence(self, sentence: bytes) -> bool:
+        """Parse a complete sentence starting with '$' (the line ending is optional) without the char by char
+        state machine. The CRC is computed over the whole body in one call and the body is split on ',' in one
+        call. Returns True if the sentence was valid, supported and parsed cleanly"""
+
+        crc_start = sentence.find(b"*")
+        if (
+            crc_start < 0
+            or len(sentence) < crc_start + 3
+            or crc_start + 1 > self.__NMEA_MAX_CHAR_COUNT
+        ):
+            return False
+
+        # A deformed CRC value is -1 and can't match
+        final_crc = _parse_crc(sentence[crc_start + 1], sentence[crc_start + 2])
+        if _xor_bytes(sentence, 1, crc_start, 0) != final_crc:
+            return False
+
+        self.sentence_active = False
+        self.gps_segments = sentence[1:crc_start].split(b",")
+
+        return self.dispatch_sentence()
+
+    def dispatch_sentence(self) -> bool:
+        """Run the parser for the sentence type in gps_segments. Returns False if the type isn't supported or
+        the sentence has fewer segments than its parser reads"""
+
+        parser = self.supported_sentences.get(self.gps_segments[0])
+        if not parser:
+            return False
+
+        try:
+            return parser(self)
+        except IndexError:  # Truncated sentence with a valid CRC
+            return False
+
     # All the currently supported NMEA sentences
     supported_sentences = {
-        "GPRMC": gprmc,
-        "GLRMC": gprmc,
-        "GNRMC": gprmc,
+        b"GPRMC": gprmc,
+        b"GLRMC": gprmc,
+        b"GNRMC": gprmc,
     }
 
 
@@ -33,6 +33,22 @@ class SSD1306(framebuf.FrameBuffer):
         self.pages = self.height // 8
         self.buffer = bytearray(self.pages * self.width)
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
+
+        # Column and page window sent before every frame, it never changes so it's built once
+        x0 = 0
+        x1 = self.width - 1
+        if self.width == 64:
+            # displays with width of 64 pixels are shifted by 32
+            x0 += 32
+            x1 += 32
+        self.window_cmds = bytes(
+            (SET_COL_ADDR, x0, x1, SET_PAGE_ADDR, 0, self.pages - 1)
+        )
+        # Same window for a single page, the page bytes are filled in by show()
+        self.page_cmds = bytearray((SET_COL_ADDR, x0, x1, SET_PAGE_ADDR, 0, 0))
+        self.buffer_view = memoryview(self.buffer)
+        # Copy of the last frame sent, None until the first full frame
+        self.shown = None
         self.init_display()
 
     def init_display(self):
@@ -85,20 +101,36 @@ class SSD1306(framebuf.FrameBuffer):
     def invert(self, invert):
         self.write_cmd(SET_NORM_INV | (invert & 1))
 
+    def write_cmds(self, cmds):
+        for cmd in cmds:
+            self.write_cmd(cmd)
+
     def show(self):
-        x0 = 0
-        x1 = self.width - 1
-        if self.width == 64:
-            # displays with width of 64 pixels are shifted by 32
-            x0 += 32
-            x1 += 32
-        self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
-        self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+        buffer = self.buffer
+        shown = self.shown
+        width = self.width
+
+        if shown is not None:
+            # Only send the 8 pixel high pages that changed since the last frame, unless most of them did
+            changed = [
+                page
+                for page in range(self.pages)
+                if buffer[page * width : (page + 1) * width]
+                != shown[page * width : (page + 1) * width]
+            ]
+            if 2 * len(changed) <= self.pages:
+                page_cmds = self.page_cmds
+                for page in changed:
+                    page_cmds[4] = page
+                    page_cmds[5] = page
+                    self.write_cmds(page_cmds)
+                    self.write_data(self.buffer_view[page * width : (page + 1) * width])
+                shown[:] = buffer
+                return
+
+        self.write_cmds(self.window_cmds)
+        self.write_data(buffer)
+        self.shown = bytearray(buffer)
 
 
 class SSD1306_I2C(SSD1306):
@@ -107,6 +139,7 @@ class SSD1306_I2C(SSD1306):
         self.addr = addr
         self.temp = bytearray(2)
         self.write_list = [b"\x40", None]  # Co=0, D/C#=1
+        self.cmd_list = [b"\x00", None]  # Co=0, D/C#=0
         super().__init__(width, height, external_vcc)
 
     def write_cmd(self, cmd):
@@ -114,6 +147,11 @@ class SSD1306_I2C(SSD1306):
         self.temp[1] = cmd
         self.i2c.writeto(self.addr, self.temp)
 
+    def write_cmds(self, cmds):
+        # All commands in one I2C transfer instead of one transfer per command byte
+        self.cmd_list[1] = cmds
+        self.i2c.writevto(self.addr, self.cmd_list)
+
     def write_data(self, buf):
         self.write_list[1] = buf
         self.i2c.writevto(self.addr, self.write_list)
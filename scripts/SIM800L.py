@@ -4,6 +4,7 @@ SIM800L Driver for MicroPython 1.20 on Raspberry Pi Pico
 sources: https://github.com/pythings/Drivers/blob/master/SIM800L.py
 """
 
+import select
 import time
 from machine import Pin, UART
 
@@ -20,14 +21,15 @@ class TimeoutError(Exception):
     pass
 
 
-network_registration: dict[str, str] = {
-    "0": "Not registered, MT is not currently searching a new operator to register to",
-    "1": "Registered, home network",
-    "2": "Not registered, but MT is currently searching a new operator to register to",
-    "3": "Registration denied",
-    "4": "Unknown",
-    "5": "Registered, roaming",
-}
+# +CREG registration status, indexed by its value
+network_registration: tuple[str, ...] = (
+    "Not registered, MT is not currently searching a new operator to register to",
+    "Registered, home network",
+    "Not registered, but MT is currently searching a new operator to register to",
+    "Registration denied",
+    "Unknown",
+    "Registered, roaming",
+)
 
 apn_list: dict[str, str] = {
     "airtel": "airtelgprs.com",
@@ -36,59 +38,95 @@ apn_list: dict[str, str] = {
     "jio": "jionet",
 }
 
-http_action_status_codes: dict[str, str] = {
-    "000": "Unknown HTTPACTION error",
-    "100": "Continue",
-    "101": "Switching Protocols",
-    "200": "OK",
-    "201": "Created",
-    "202": "Accepted",
-    "203": "Non-Authoritative Information",
-    "204": "No Content",
-    "205": "Reset Content",
-    "206": "Partial Content",
-    "300": "Multiple Choices",
-    "301": "Moved Permanently",
-    "302": "Found",
-    "303": "See Other",
-    "304": "Not Modified",
-    "305": "Use Proxy",
-    "307": "Temporary Redirect",
-    "400": "Bad Request",
-    "401": "Unauthorized",
-    "402": "Payment Required",
-    "403": "Forbidden",
-    "404": "Not Found",
-    "405": "Method Not Allowed",
-    "406": "Not Acceptable",
-    "407": "Proxy Authentication Required",
-    "408": "Request Time-out",
-    "409": "Conflict",
-    "410": "Gone",
-    "411": "Length Required",
-    "412": "Precondition Failed",
-    "413": "Request Entity Too Large",
-    "414": "Request-URI Too Large",
-    "415": "Unsupported Media Type",
-    "416": "Requested range not satisfiable",
-    "417": "Expectation Failed",
-    "500": "Internal Server Error",
-    "501": "Not Implemented",
-    "502": "Bad Gateway",
-    "503": "Service Unavailable",
-    "504": "Gateway Time-out",
-    "505": "HTTP Version not supported",
-    "600": "Not HTTP PDU",
-    "601": "Network Error",
-    "602": "No memory",
-    "603": "DNS Error",
-    "604": "Stack Busy",
-    "605": "SSL failed to establish channels",
-    "606": "SSL fatal alert message with immediate connection termination",
-}
+# +CBC battery charge status, indexed by its value
+battery_charge_status: tuple[str, ...] = (
+    "Not charging",
+    "Charging",
+    "Finished charging",
+)
+
+# +CSQ RxQual to BER conversion, indexed by its value
+rx_quality_ber: tuple[str, ...] = (
+    "BER < 0.2%",
+    "0.2% < BER < 0.4%",
+    "0.4% < BER < 0.8%",
+    "0.8% < BER < 1.6%",
+    "1.6% < BER < 3.2%",
+    "3.2% < BER < 6.4%",
+    "6.4% < BER < 12.8%",
+    "12.8% < BER",
+)
+
+# HTTPACTION status code names, one "<code> <name>" per line. A single string keeps the rarely used names out of the
+# heap as separate objects, http_action_status() slices out the one that is needed
+_http_action_status_names: str = (
+    "\n"
+    "0 Unknown HTTPACTION error\n"
+    "100 Continue\n"
+    "101 Switching Protocols\n"
+    "200 OK\n"
+    "201 Created\n"
+    "202 Accepted\n"
+    "203 Non-Authoritative Information\n"
+    "204 No Content\n"
+    "205 Reset Content\n"
+    "206 Partial Content\n"
+    "300 Multiple Choices\n"
+    "301 Moved Permanently\n"
+    "302 Found\n"
+    "303 See Other\n"
+    "304 Not Modified\n"
+    "305 Use Proxy\n"
+    "307 Temporary Redirect\n"
+    "400 Bad Request\n"
+    "401 Unauthorized\n"
+    "402 Payment Required\n"
+    "403 Forbidden\n"
+    "404 Not Found\n"
+    "405 Method Not Allowed\n"
+    "406 Not Acceptable\n"
+    "407 Proxy Authentication Required\n"
+    "408 Request Time-out\n"
+    "409 Conflict\n"
+    "410 Gone\n"
+    "411 Length Required\n"
+    "412 Precondition Failed\n"
+    "413 Request Entity Too Large\n"
+    "414 Request-URI Too Large\n"
+    "415 Unsupported Media Type\n"
+    "416 Requested range not satisfiable\n"
+    "417 Expectation Failed\n"
+    "500 Internal Server Error\n"
+    "501 Not Implemented\n"
+    "502 Bad Gateway\n"
+    "503 Service Unavailable\n"
+    "504 Gateway Time-out\n"
+    "505 HTTP Version not supported\n"
+    "600 Not HTTP PDU\n"
+    "601 Network Error\n"
+    "602 No memory\n"
+    "603 DNS Error\n"
+    "604 Stack Busy\n"
+    "605 SSL failed to establish channels\n"
+    "606 SSL fatal alert message with immediate connection termination\n"
+)
+
+
+def http_action_status(status_code: int) -> str:
+    """Name of an HTTPACTION status code, "Unknown" if it isn't a known one"""
+    start = _http_action_status_names.find(f"\n{status_code} ")
+    if start < 0:
+        return "Unknown"
+
+    start = _http_action_status_names.find(" ", start) + 1
+    return _http_action_status_names[
+        start : _http_action_status_names.find("\n", start)
+    ]
 
 
 class LocationResponse(object):
+    __slots__ = ("code", "lat", "lng", "acc", "date", "time")
+
     def __init__(
         self, code: int, lat: float, lng: float, acc: int, date: str, time: str
     ) -> None:
@@ -107,13 +145,17 @@ class LocationResponse(object):
 
 
 class Response(object):
+    __slots__ = ("status_code", "content")
+
     def __init__(self, status_code, content) -> None:
         self.status_code: int = int(status_code)
-        self.status: str = http_action_status_codes.get(
-            str(self.status_code), "Unknown"
-        )
         self.content: str = content
 
+    @property
+    def status(self) -> str:
+        """Name of the status code, only looked up when it is read"""
+        return http_action_status(self.status_code)
+
     def __str__(self) -> str:
         return f"Response({self.status_code}, {self.status}, {self.content})"
 
@@ -122,6 +164,8 @@ class Response(object):
 
 
 class ATCommand(object):
+    __slots__ = ("string", "raw_bytes", "timeout", "end", "end_bytes", "echo_bytes")
+
     def __init__(
         self, string: str, timeout: int, end: str, raw_bytes: bytes | None = None
     ) -> None:
@@ -129,6 +173,9 @@ class ATCommand(object):
         self.raw_bytes: bytes = raw_bytes or bytes(string + "\r\n", "utf-8")
         self.timeout: int = timeout
         self.end: str = end
+        # What execute() compares the received lines against, encoded once here instead of on every call
+        self.end_bytes: bytes = bytes(end, "utf-8")
+        self.echo_bytes: bytes = bytes(string + "\r\r\n", "utf-8")
 
     def __str__(self) -> str:
         return f'ATCommand("{self.string}", {self.timeout}, "{self.end}")'
@@ -138,6 +185,8 @@ class ATCommand(object):
 
 
 class Network(object):
+    __slots__ = ("name", "shortname", "id")
+
     def __init__(self, name: str, shortname: str, id: str) -> None:
         self.name: str = name
         self.shortname: str = shortname
@@ -151,6 +200,8 @@ class Network(object):
 
 
 class CellInfo(object):
+    __slots__ = ("oper", "mcc", "mnc", "lac", "cellId", "bsic", "rxlev", "afcn")
+
     def __init__(
         self,
         oper: str,
@@ -183,69 +234,49 @@ class Commands(object):
     # https://cdn-shop.adafruit.com/datasheets/sim800_series_at_command_manual_v1.01.pdf
     # https://www.elecrow.com/wiki/images/2/20/SIM800_Series_AT_Command_Manual_V1.09.pdf
     # https://www.avnet.com/wps/wcm/connect/onesite/5ddc2831-b698-44ac-92f5-50d79a14cb3f/Heracles-SIMCOM_GSM+Location_Application+Note_V1.02.pdf?MOD=AJPERES&CVID=m31n15G&CVID=m31n15G&CVID=m31jwAj&CVID=m31jwAj
-    @staticmethod
-    def enableErrorCodes() -> ATCommand:
-        """Report Mobile Equipment Error"""
-        return ATCommand("AT+CMEE=2", 3, "OK")
 
-    @staticmethod
-    def productInfo() -> ATCommand:
-        """Display Product Identification Information"""
-        return ATCommand("ATI", 10, "OK")
+    # Report Mobile Equipment Error
+    enableErrorCodes = ATCommand("AT+CMEE=2", 3, "OK")
 
-    @staticmethod
-    def firmwareRevision() -> ATCommand:
-        """Request TA revision identification of software release"""
-        return ATCommand("AT+CGMR", 3, "OK")
+    # Display Product Identification Information
+    productInfo = ATCommand("ATI", 10, "OK")
 
-    @staticmethod
-    def isSIMInserted() -> ATCommand:
-        """Check if SIM card is inserted"""
-        return ATCommand("AT+CSMINS?", 3, "OK")
+    # Request TA revision identification of software release
+    firmwareRevision = ATCommand("AT+CGMR", 3, "OK")
 
-    @staticmethod
-    def batteryCharge() -> ATCommand:
-        """Battery Charge"""
-        return ATCommand("AT+CBC", 3, "OK")
+    # Check if SIM card is inserted
+    isSIMInserted = ATCommand("AT+CSMINS?", 3, "OK")
 
-    @staticmethod
-    def scanOperators() -> ATCommand:
-        return ATCommand("AT+COPS=?", 60, "OK")
+    # Battery Charge
+    batteryCharge = ATCommand("AT+CBC", 3, "OK")
 
-    @staticmethod
-    def currentOperator() -> ATCommand:
-        """TA returns the current mode and the currently selected operator."""
-        return ATCommand("AT+COPS?", 3, "OK")
+    scanOperators = ATCommand("AT+COPS=?", 60, "OK")
 
-    @staticmethod
-    def readOpeartorNames() -> ATCommand:
-        """Read Operator Names"""
-        return ATCommand("AT+COPN", 60, "OK")
+    # TA returns the current mode and the currently selected operator.
+    currentOperator = ATCommand("AT+COPS?", 3, "OK")
 
-    @staticmethod
-    def scanCellInfo() -> ATCommand:
-        """Scan Cell Tower Info"""
-        return ATCommand("AT+CNETSCAN", 60, "OK")
+    # Read Operator Names
+    readOpeartorNames = ATCommand("AT+COPN", 60, "OK")
+
+    # Scan Cell Tower Info
+    scanCellInfo = ATCommand("AT+CNETSCAN", 60, "OK")
 
     @staticmethod
     def setCellInfoDetails(show: int) -> ATCommand:
         """Set Cell Tower Info\nShow:1 Hide:0"""
         return ATCommand(f"AT+CNETSCAN={show}", 3, "OK")
 
-    @staticmethod
-    def signalQuality() -> ATCommand:
-        """Signal Quality Report"""
-        return ATCommand("AT+CSQ", 3, "OK")
+    # Show Cell Tower Info
+    showCellInfoDetails = ATCommand("AT+CNETSCAN=1", 3, "OK")
 
-    @staticmethod
-    def getServiceProviderName() -> ATCommand:
-        """Get Service Provider Name"""
-        return ATCommand("AT+CSPN?", 3, "OK")
+    # Signal Quality Report
+    signalQuality = ATCommand("AT+CSQ", 3, "OK")
 
-    @staticmethod
-    def checkNetworkRegistration() -> ATCommand:
-        """Network Registration Status"""
-        return ATCommand("AT+CREG?", 3, "OK")
+    # Get Service Provider Name
+    getServiceProviderName = ATCommand("AT+CSPN?", 3, "OK")
+
+    # Network Registration Status
+    checkNetworkRegistration = ATCommand("AT+CREG?", 3, "OK")
 
     @staticmethod
     def setBearerAPN(apn: str) -> ATCommand:
@@ -262,40 +293,26 @@ class Commands(object):
         """Set bearer Password"""
         return ATCommand(f'AT+SAPBR=3,1,"PWD","{password}"', 3, "OK")
 
-    @staticmethod
-    def setBearerGPRS() -> ATCommand:
-        """Set bearer GPRS"""
-        return ATCommand('AT+SAPBR=3,1,"CONTYPE","GPRS"', 3, "OK")
+    # Set bearer GPRS
+    setBearerGPRS = ATCommand('AT+SAPBR=3,1,"CONTYPE","GPRS"', 3, "OK")
 
-    @staticmethod
-    def openBearer() -> ATCommand:
-        """Open bearer"""
-        return ATCommand("AT+SAPBR=1,1", 3, "OK")
+    # Open bearer
+    openBearer = ATCommand("AT+SAPBR=1,1", 3, "OK")
 
-    @staticmethod
-    def closeBearer() -> ATCommand:
-        """Close bearer"""
-        return ATCommand("AT+SAPBR=0,1", 3, "OK")
+    # Close bearer
+    closeBearer = ATCommand("AT+SAPBR=0,1", 3, "OK")
 
-    @staticmethod
-    def bearerStatus() -> ATCommand:
-        """Bearer status"""
-        return ATCommand("AT+SAPBR=2,1", 30, "OK")
+    # Bearer status
+    bearerStatus = ATCommand("AT+SAPBR=2,1", 30, "OK")
 
-    @staticmethod
-    def GSMLocation() -> ATCommand:
-        """Get GSM Location & Time"""
-        return ATCommand("AT+CLBS=4,1", 45, "OK")
+    # Get GSM Location & Time
+    GSMLocation = ATCommand("AT+CLBS=4,1", 45, "OK")
 
-    @staticmethod
-    def initHTTP() -> ATCommand:
-        """Initialize HTTP service"""
-        return ATCommand("AT+HTTPINIT", 3, "OK")
+    # Initialize HTTP service
+    initHTTP = ATCommand("AT+HTTPINIT", 3, "OK")
 
-    @staticmethod
-    def closeHTTP() -> ATCommand:
-        """Terminate HTTP service"""
-        return ATCommand("AT+HTTPTERM", 3, "OK")
+    # Terminate HTTP service
+    closeHTTP = ATCommand("AT+HTTPTERM", 3, "OK")
 
     @staticmethod
     def setHTTPParameterURL(url: str) -> ATCommand:
@@ -307,20 +324,19 @@ class Commands(object):
         """Set HTTP parameter cid"""
         return ATCommand(f'AT+HTTPPARA="CID",{cid}', 3, "OK")
 
+    # Set HTTP parameter cid to the bearer opened by connectGPRS
+    setHTTPParameterBearerCID = ATCommand('AT+HTTPPARA="CID",1', 3, "OK")
+
     @staticmethod
     def setHTTPParameterContent(content: str) -> ATCommand:
         """Set HTTP parameter content"""
         return ATCommand(f'AT+HTTPPARA="CONTENT","{content}"', 3, "OK")
 
-    @staticmethod
-    def HTTPActionGET() -> ATCommand:
-        """HTTP GET"""
-        return ATCommand("AT+HTTPACTION=0", 30, "+HTTPACTION")
+    # HTTP GET
+    HTTPActionGET = ATCommand("AT+HTTPACTION=0", 30, "+HTTPACTION")
 
-    @staticmethod
-    def HTTPActionPOST() -> ATCommand:
-        """HTTP POST"""
-        return ATCommand("AT+HTTPACTION=1", 30, "+HTTPACTION")
+    # HTTP POST
+    HTTPActionPOST = ATCommand("AT+HTTPACTION=1", 30, "+HTTPACTION")
 
     @staticmethod
     def HTTPData(data_len: int) -> ATCommand:
@@ -332,35 +348,33 @@ class Commands(object):
         """Dump Data"""
         return ATCommand(data, 3, "OK")
 
-    @staticmethod
-    def HTTPRead() -> ATCommand:
-        """HTTP Read"""
-        return ATCommand("AT+HTTPREAD", 30, "OK")
+    # HTTP Read
+    HTTPRead = ATCommand("AT+HTTPREAD", 30, "OK")
 
-    @staticmethod
-    def checkSSL() -> ATCommand:
-        """Check SSL"""
-        return ATCommand("AT+HTTPSSL?", 3, "OK")
+    # Check SSL
+    checkSSL = ATCommand("AT+HTTPSSL?", 3, "OK")
 
     @staticmethod
     def setSSL(ssl: int) -> ATCommand:
         """Set SSL"""
         return ATCommand(f"AT+HTTPSSL={ssl}", 3, "OK")
 
+    # Enable SSL
+    enableSSL = ATCommand("AT+HTTPSSL=1", 3, "OK")
+
+    # Disable SSL
+    disableSSL = ATCommand("AT+HTTPSSL=0", 3, "OK")
+
     @staticmethod
     def connectTcp(domain: str, port: int) -> ATCommand:
         """Connect TCP"""
         return ATCommand(f'AT+CIPSTART="TCP","{domain}",{port}', 30, "CONNECT OK")
 
-    @staticmethod
-    def closeTcp() -> ATCommand:
-        """Close TCP"""
-        return ATCommand("AT+CIPCLOSE", 3, "CLOSE OK")
+    # Close TCP
+    closeTcp = ATCommand("AT+CIPCLOSE", 3, "CLOSE OK")
 
-    @staticmethod
-    def sendTcpSendHeader() -> ATCommand:
-        """Send TCP Data"""
-        return ATCommand(f"AT+CIPSEND", 3, "> ")
+    # Send TCP Data
+    sendTcpSendHeader = ATCommand("AT+CIPSEND", 3, "> ")
 
     @staticmethod
     def sendTcpDataBytes(data: bytes) -> ATCommand:
@@ -392,14 +406,23 @@ class SIM800L(object):
         self.ipAddr: str | None = None
         self.GPRSinitialized: bool = False
         self.HTTPinitialized: bool = False
+        # APN found for the service provider by the last connectGPRS, so reconnects don't look it up again
+        self.cachedAPN: str | None = None
+        # URL currently set in the HTTP service, so repeated requests to the same URL don't set it again
+        self.HTTPurl: str | None = None
         self.debugMode: bool = debugMode
+        # Bytes drained from the UART that have not been consumed as a line yet
+        self._rx: bytes = b""
+        # Lets execute() sleep until the modem sends something
+        self._poller = select.poll()
+        self._poller.register(uart, select.POLLIN)
 
     def initialize(self) -> bool:
         retries = 0
         # Test AT commands
         while True:
             try:
-                self.modemInfo = self.execute(Commands.productInfo())
+                self.modemInfo = self.execute(Commands.productInfo)
             except:
                 retries += 1
                 if retries < 3:
@@ -410,17 +433,17 @@ class SIM800L(object):
                 break
 
         # Check if SIM card is inserted
-        x = self.execute(Commands.isSIMInserted())
+        x = self.execute(Commands.isSIMInserted)
         if "+CSMINS: 0,1" not in x:
             raise Exception(f"SIM card is not inserted, Module Response: {x}")
 
         # Set initialized flag and support vars
         self.initialized = True
         # Check if SSL is supported
-        self.sslSupported = self.execute(Commands.checkSSL()) == "+CIPSSL: (0-1)"
+        self.sslSupported = self.execute(Commands.checkSSL) == "+CIPSSL: (0-1)"
 
         if self.showSpecificErrors:
-            self.execute(Commands.enableErrorCodes())
+            self.execute(Commands.enableErrorCodes)
 
         return self.initialized
 
@@ -428,6 +451,38 @@ class SIM800L(object):
     # Execute AT commands
     # ----------------------
 
+    def _readline(self, end: bytes) -> bytes | None:
+        """Return the next line received from the modem, or None if a full line is not available yet.
+        Everything waiting in the UART is drained in a single read and split into lines here. A trailing partial
+        line is only returned for a prompt style end like "> ", which the modem sends without a newline. Any
+        other partial line (e.g. a URC split across reads) waits for its newline
+        """
+        self._drain()
+
+        index = self._rx.find(b"\n")
+        if index < 0:
+            if not end.endswith(b" ") or not self._rx.endswith(end):
+                return None
+            index = len(self._rx) - 1
+
+        line = self._rx[: index + 1]
+        self._rx = self._rx[index + 1 :]
+        return line
+
+    def _drain(self) -> None:
+        """Move everything waiting in the UART to the receive buffer"""
+        while waiting := self.uart.any():
+            self._rx += self.uart.read(waiting)
+
+    def _waitForData(self, command: ATCommand, deadline: int) -> None:
+        """Block until the UART has data or the command deadline has passed, raise TimeoutError after it"""
+        remaining = time.ticks_diff(deadline, time.ticks_ms())
+        if remaining <= 0:
+            raise TimeoutError(
+                f'Timeout for command "{command.string}" (timeout={command.timeout})'
+            )
+        self._poller.poll(remaining)
+
     def execute(self, command: ATCommand, clean_output: bool = True) -> str:
         # Execute the AT command
         if self.debugMode:
@@ -435,47 +490,49 @@ class SIM800L(object):
 
         self.uart.write(command.raw_bytes)
 
-        # Support vars
+        # Support vars, the command fields are looked up once and lines are compared as bytes
         pre_end: bool = True
-        output: str = ""
-        empty_reads: int = 0
+        output: list[bytes] = []
         processed_lines: int = 0
+        readline = self._readline
+        deadline: int = time.ticks_add(time.ticks_ms(), command.timeout * 1000)
+        end: bytes = command.end_bytes
+        echo: bytes = command.echo_bytes
+        drop_httpread: bool = command.string == "AT+HTTPREAD"
 
         while True:
-            line = self.uart.readline()
+            line = readline(end)
 
+            # Nothing to process yet, block until the UART has data or the command times out
             if not line:
-                time.sleep(1)
-                empty_reads += 1
-                if empty_reads > command.timeout:
-                    raise TimeoutError(
-                        f'Timeout for command "{command.string}" (timeout={command.timeout})'
-                    )
+                self._waitForData(command, deadline)
             else:
                 if self.debugMode:
                     print(f"SIM Module: Received: {line}")
 
-                # Convert line to string
-                line_str: str = str(line, "UTF-8")  # type: ignore
-
                 # Do we have an error?
-                if line_str == "ERROR\r\n":
+                if line == b"ERROR\r\n":
                     raise GenericATError("Got generic AT error")
                 # Specific error
-                if line_str.startswith("+CME ERROR"):
+                if line.startswith(b"+CME ERROR"):
                     raise SpecificATError(
-                        line_str + "\nError in command:" + command.string
+                        str(line, "UTF-8") + "\nError in command:" + command.string
                     )
 
-                # If we had a pre-end, do we have the expected end?
-                if command.end in line_str:
-                    break
-                if pre_end and line_str.startswith(command.end):
-                    output += line_str
+                # The command echo is dropped here, it is never the end even if it contains it (AT+HTTPACTION)
+                if line == echo:
+                    pre_end = False
+                    continue
+
+                # Do we have the expected end? If we had a pre-end and the end line carries more than the end
+                # itself (e.g. "+HTTPACTION: 0,200,11"), keep it
+                if end in line:
+                    if pre_end and line.rstrip(b"\r\n") != end:
+                        output.append(line)
                     break
 
                 # Do we have a pre-end?
-                if line_str == "\r\n":
+                if line == b"\r\n":
                     pre_end = True
                 else:
                     pre_end = False
@@ -484,31 +541,33 @@ class SIM800L(object):
                 processed_lines += 1
 
                 # Save this line unless in particular conditions
-                if command.string == "AT+HTTPREAD" and line_str.startswith(
-                    "+HTTPREAD:"
-                ):
-                    pass
-                else:
-                    output += line_str
+                if not (drop_httpread and line.startswith(b"+HTTPREAD:")):
+                    output.append(line)
 
-        # Remove the command string from the output
-        output = output.replace(command.string + "\r\r\n", "")
+        # Join the saved lines once
+        result: bytes = b"".join(output)
 
         # ..and remove the last \r\n added by the AT protocol
-        if output.endswith("\r\n"):
-            output = output[:-2]
+        if result.endswith(b"\r\n"):
+            result = result[:-2]
 
-        # Also, clean output if needed
+        # Also, clean output if needed. Once every "\n\n" is gone at most a single "\n" is left on each end
         if clean_output:
-            output = output.replace("\r", "")
-            output = output.replace("\n\n", "")
-            if output.startswith("\n"):
-                output = output[1:]
-            if output.endswith("\n"):
-                output = output[:-1]
-
-        # Return
-        return output
+            result = result.replace(b"\r", b"").replace(b"\n\n", b"").strip(b"\n")
+
+        # Return it converted to string, only the cleaned output is decoded
+        return str(result, "UTF-8")
+
+    def executeBatch(self, commands: list[ATCommand]) -> str:
+        """Execute several "AT..." commands that all end with OK as one command line, concatenated with ";" as the AT
+        command syntax allows. The modem runs them in order and answers once, so they take a single round trip
+        """
+        command = ATCommand(
+            "AT" + ";".join([command.string[2:] for command in commands]),
+            sum([command.timeout for command in commands]),
+            "OK",
+        )
+        return self.execute(command)
 
     # ----------------------
     #  Function commands
@@ -516,28 +575,28 @@ class SIM800L(object):
 
     def reset(self) -> None:
         """Reset the modem"""
+        self.cachedAPN = None
+        # The SIM800L datasheet asks for a reset pulse of at least 105ms
         self.reset_pin.low()
-        time.sleep(1)
+        time.sleep_ms(150)
         self.reset_pin.high()
 
     def getModemInfo(self) -> str:
         """Get modem info"""
-        self.modem_info = self.execute(Commands.productInfo())
+        self.modem_info = self.execute(Commands.productInfo)
         return self.modem_info
 
     def batteryStatus(self) -> tuple[str, str, str]:
         """Get battery status"""
-        output = self.execute(Commands.batteryCharge())
+        output = self.execute(Commands.batteryCharge)
 
-        battChargeStatus, battLevel, battVoltage = output.split(":")[1].split(",")
+        battChargeStatus, battLevel, battVoltage = (
+            output.partition(":")[2].strip().split(",")
+        )
         # Map values to battery charge state
-        if battChargeStatus == "0":
-            battChargeStatus = "Not charging"
-        elif battChargeStatus == "1":
-            battChargeStatus = "Charging"
-        elif battChargeStatus == "2":
-            battChargeStatus = "Finished charging"
-        else:
+        try:
+            battChargeStatus = battery_charge_status[int(battChargeStatus)]
+        except (ValueError, IndexError):
             battChargeStatus = "Power fault"
 
         # More conversions
@@ -547,33 +606,39 @@ class SIM800L(object):
 
     def scanNetworks(self) -> list[Network]:
         """Scan networks"""
-        output = self.execute(Commands.scanOperators())
+        output = self.execute(Commands.scanOperators)
         networks: list[Network] = []
-        raw_networks = output.split(":", 1)[1].strip().split(",,")[0].split(",(")
-
-        for raw_network in raw_networks:
-            raw_networks = (
-                raw_network.replace('"', "")
-                .replace("(", "")
-                .replace(")", "")
-                .split(",")
-            )
-            if len(raw_networks) != 4:
-                continue
-            networks.append(
-                Network(
-                    name=raw_networks[1],
-                    shortname=raw_networks[2],
-                    id=raw_networks[3],
+
+        # Operators are listed as (stat,"name","shortname","id") up to the ",," before the supported modes
+        end = output.find(",,")
+        if end < 0:
+            end = len(output)
+
+        # Walk the parentheses in place instead of splitting and cleaning the whole response
+        start = output.find("(", 0, end)
+        while start >= 0:
+            stop = output.find(")", start, end)
+            if stop < 0:
+                break
+
+            raw_network = output[start + 1 : stop].split(",")
+            if len(raw_network) == 4:
+                networks.append(
+                    Network(
+                        name=raw_network[1].strip('"'),
+                        shortname=raw_network[2].strip('"'),
+                        id=raw_network[3].strip('"'),
+                    )
                 )
-            )
+
+            start = output.find("(", stop, end)
 
         return networks
 
     def getCurrentNetwork(self) -> dict | None:
         """Get current network"""
-        output = self.execute(Commands.currentOperator())
-        network = output.split(":")[1].strip().split(",")
+        output = self.execute(Commands.currentOperator)
+        network = output.partition(":")[2].strip().split(",")
 
         if len(network) != 3:
             return None
@@ -581,31 +646,31 @@ class SIM800L(object):
         return {
             "mode": network[0],
             "format": network[1],
-            "oper": network[2].replace('"', ""),
+            "oper": network[2].strip('"'),
         }
 
     def getServiceProviderName(self) -> str:
         """Get Service Provider Name"""
-        output = self.execute(Commands.getServiceProviderName())
-        return output.split(":")[1].split(",")[0].replace('"', "").strip()
+        output = self.execute(Commands.getServiceProviderName)
+        return output.partition(":")[2].partition(",")[0].strip().strip('"')
 
     def networkRegisterationStatus(self) -> tuple[bool, str, str]:
         """Check if network is registered"""
-        output = self.execute(Commands.checkNetworkRegistration())
-        code = output.split(",")[1]
-        return (code == "1" or code == "5", code, network_registration[code])
+        output = self.execute(Commands.checkNetworkRegistration)
+        code = output.partition(",")[2].partition(",")[0]
+        return (code == "1" or code == "5", code, network_registration[int(code)])
 
     def getAPN(self) -> str:
         provider = self.getServiceProviderName().lower()
-        if provider in apn_list:
-            return apn_list[provider]
-        else:
+        apn = apn_list.get(provider)
+        if apn is None:
             raise Exception(f'APN for "{provider}" not found')
+        return apn
 
     def getCellTowerInfo(self) -> list[CellInfo]:
         """Get Cell Tower Info"""
-        self.execute(Commands.setCellInfoDetails(1))
-        output: str = self.execute(Commands.scanCellInfo())
+        self.execute(Commands.showCellInfoDetails)
+        output: str = self.execute(Commands.scanCellInfo)
         lines: list[str] = output.split("\n")
         cells: list[CellInfo] = []
 
@@ -613,16 +678,20 @@ class SIM800L(object):
             rawCell: list[str] = line.split(",")
             if len(rawCell) != 8:
                 continue
+            # Fields are "Name:value", slice the value out after the ":" instead of splitting every field
+            oper, mcc, mnc, rxlev, cellId, afcn, lac, bsic = [
+                field[field.find(":") + 1 :] for field in rawCell
+            ]
             cells.append(
                 CellInfo(
-                    oper=rawCell[0].split('"')[1],
-                    mcc=int(rawCell[1].split(":")[1]),
-                    mnc=int(rawCell[2].split(":")[1]),
-                    rxlev=int(rawCell[3].split(":")[1]),
-                    cellId=int(rawCell[4].split(":")[1], 16),
-                    afcn=int(rawCell[5].split(":")[1]),
-                    lac=int(rawCell[6].split(":")[1], 16),
-                    bsic=int(rawCell[7].split(":")[1], 16),
+                    oper=oper.strip('"'),
+                    mcc=int(mcc),
+                    mnc=int(mnc),
+                    rxlev=int(rxlev),
+                    cellId=int(cellId, 16),
+                    afcn=int(afcn),
+                    lac=int(lac, 16),
+                    bsic=int(bsic, 16),
                 )
             )
 
@@ -630,36 +699,21 @@ class SIM800L(object):
 
     def getSignalStrength(self) -> tuple[float, str]:
         """Get signal strength"""
-        output = self.execute(Commands.signalQuality())
-        rssi, rxQual = output.split(":")[1].split(",")
+        output = self.execute(Commands.signalQuality)
+        rssi, rxQual = output.partition(":")[2].strip().split(",")
         # 30 is the maximum value (2 is the minimum)
-        RSSI = float(rssi) * 100 / float(30) if rssi != "99" else 99
+        RSSI = float(rssi) * 100 / 30 if rssi != "99" else 99
         # RxQual to BER conversion
-        rxQual = int(rxQual)
-        if rxQual == 0:
-            ber = "BER < 0.2%"
-        elif rxQual == 1:
-            ber = "0.2% < BER < 0.4%"
-        elif rxQual == 2:
-            ber = "0.4% < BER < 0.8%"
-        elif rxQual == 3:
-            ber = "0.8% < BER < 1.6%"
-        elif rxQual == 4:
-            ber = "1.6% < BER < 3.2%"
-        elif rxQual == 5:
-            ber = "3.2% < BER < 6.4%"
-        elif rxQual == 6:
-            ber = "6.4% < BER < 12.8%"
-        elif rxQual == 7:
-            ber = "12.8% < BER"
-        else:
-            ber = f"99"
+        try:
+            ber = rx_quality_ber[int(rxQual)]
+        except (ValueError, IndexError):
+            ber = "99"
 
         return RSSI, ber
 
     def getIP(self) -> str | None:
         """Get IP address"""
-        output = self.execute(Commands.bearerStatus())
+        output = self.execute(Commands.bearerStatus)
         output = output.split("+")[-1]
         pieces = output.split(",")
         if len(pieces) != 3:
@@ -673,8 +727,8 @@ class SIM800L(object):
 
     def getGsmLocation(self):
         """Get GSM Location & Time*\nTime is in the format of triangulation server, CST (UTC + 8) by default"""
-        output = self.execute(Commands.GSMLocation())
-        pieces = output.split(":", 1)[1].strip().split(",")
+        output = self.execute(Commands.GSMLocation)
+        pieces = output.partition(":")[2].strip().split(",")
 
         if len(pieces) != 6:
             raise Exception(f'Cannot parse "{output}" to get GSM location')
@@ -692,7 +746,8 @@ class SIM800L(object):
         """Connect to GPRS \n If no APN is provided, the APN will be automatically set based on the service provider name"""
         # If no APN is provided, the APN will be automatically set based on the service provider name
         if not apn:
-            apn = self.getAPN()
+            apn = self.cachedAPN or self.getAPN()
+            self.cachedAPN = apn
 
         if not self.initialized:
             raise Exception("Modem is not initialized, cannot connect")
@@ -704,35 +759,36 @@ class SIM800L(object):
 
         # Closing bearer if left opened from a previous connect gone wrong:
         try:
-            self.execute(Commands.closeBearer())
+            self.execute(Commands.closeBearer)
         except GenericATError:
             pass
         except SpecificATError:
             pass
 
         # Set bearer parameters
-        self.execute(Commands.setBearerGPRS())
-        self.execute(Commands.setBearerAPN(apn))
+        commands = [Commands.setBearerGPRS, Commands.setBearerAPN(apn)]
         if username:
-            self.execute(Commands.setBearerUsername(username))
+            commands.append(Commands.setBearerUsername(username))
         if password:
-            self.execute(Commands.setBearerPassword(password))
+            commands.append(Commands.setBearerPassword(password))
+        self.executeBatch(commands)
         # Then, open the GPRS connection.
-        self.execute(Commands.openBearer())
+        self.execute(Commands.openBearer)
 
-        # Ok, now wait until we get a valid IP address
+        # Ok, now wait until we get a valid IP address, doubling the wait between checks
         retries = 0
         max_retries = 5
+        delay = 1
         while True:
             retries += 1
             self.ipAddr = self.getIP()
             if not self.ipAddr:
-                retries += 1
-                if retries > max_retries:
+                if retries >= max_retries:
                     raise Exception(
                         "Cannot connect modem as could not get a valid IP address"
                     )
-                time.sleep(1)
+                time.sleep(delay)
+                delay = min(delay * 2, 8)
             else:
                 break
         self.GPRSinitialized = True
@@ -741,7 +797,7 @@ class SIM800L(object):
     def disconnectGPRS(self):
         # Close bearer
         try:
-            self.execute(Commands.closeBearer())
+            self.execute(Commands.closeBearer)
         except GenericATError:
             pass
         except SpecificATError:
@@ -767,15 +823,107 @@ class SIM800L(object):
         except SpecificATError:
             pass
         # Initialize HTTP Service
-        self.execute(Commands.initHTTP())
+        self.execute(Commands.initHTTP)
         # Bearer profile identifier
-        self.execute(Commands.setHTTPParameterCID(1))
+        self.execute(Commands.setHTTPParameterBearerCID)
         self.HTTPinitialized = True
+        self.HTTPurl = None
 
     def closeHTTP(self) -> None:
         """Terminate HTTP service"""
-        self.execute(Commands.closeHTTP())
+        self.execute(Commands.closeHTTP)
         self.HTTPinitialized = False
+        self.HTTPurl = None
+
+    def _setHTTPUrl(self, url: str) -> None:
+        """Set the HTTP url, unless it is already the one set"""
+        if not self.HTTPinitialized:
+            raise Exception("HTTP service is not initialized")
+
+        if url != self.HTTPurl:
+            # Forget the cached url first in case setting it fails
+            self.HTTPurl = None
+            self.execute(Commands.setHTTPParameterURL(url))
+            self.HTTPurl = url
+
+    def _HTTPAction(self, action: ATCommand) -> Response:
+        """Run a HTTP action and read its response"""
+        output = self.execute(action)
+        # "+HTTPACTION: <method>,<status code>,<data length>"
+        status_code, _, data_length = output.partition(",")[2].partition(",")
+
+        # Only read the data back if there is any
+        if data_length.strip() == "0" or status_code in ("204", "304"):
+            return Response(status_code=status_code, content="")
+
+        return Response(status_code=status_code, content=self._readHTTPData())
+
+    def _readHTTPData(self) -> str:
+        """Read the data of the last HTTP action. The modem replies to AT+HTTPREAD with "+HTTPREAD: <length>", the
+        data and OK, so the data is taken by its length instead of line by line through execute(), where a data line
+        looking like an error or holding "OK" would end the read"""
+        command = Commands.HTTPRead
+        if self.debugMode:
+            print(f"SIM Module: Executing: {command.raw_bytes}")
+
+        self.uart.write(command.raw_bytes)
+        deadline: int = time.ticks_add(time.ticks_ms(), command.timeout * 1000)
+
+        # Wait for the data length, there is no data if the modem replies OK straight away
+        while True:
+            line = self._readline(command.end_bytes)
+            if not line:
+                self._waitForData(command, deadline)
+            elif line == b"ERROR\r\n":
+                raise GenericATError("Got generic AT error")
+            elif line.startswith(b"+CME ERROR"):
+                raise SpecificATError(
+                    str(line, "UTF-8") + "\nError in command:" + command.string
+                )
+            elif line.startswith(b"+HTTPREAD:"):
+                length = int(line[10:])
+                break
+            elif line == b"OK\r\n":
+                return ""
+
+        # Take the data, then skip the OK that follows it
+        while len(self._rx) < length:
+            self._drain()
+            if len(self._rx) < length:
+                self._waitForData(command, deadline)
+
+        data = self._rx[:length]
+        self._rx = self._rx[length:]
+
+        while True:
+            line = self._readline(command.end_bytes)
+            if not line:
+                self._waitForData(command, deadline)
+            elif command.end_bytes in line:
+                break
+
+        if self.debugMode:
+            print(f"SIM Module: Received: {data}")
+
+        return str(data, "UTF-8")
+
+    def httpGet(self, url: str) -> Response:
+        """Make HTTP GET request. NOTE: Initiale HTTP before making a request."""
+        self._setHTTPUrl(url)
+        return self._HTTPAction(Commands.HTTPActionGET)
+
+    def httpPost(
+        self, url: str, data: str, contentType: str = "application/json"
+    ) -> Response:
+        """Make HTTP POST request. NOTE: Initiale HTTP before making a request."""
+        self._setHTTPUrl(url)
+
+        # Send data
+        self.execute(Commands.setHTTPParameterContent(contentType))
+        self.execute(Commands.HTTPData(len(data)))
+        self.execute(Commands.dumpData(data))
+
+        return self._HTTPAction(Commands.HTTPActionPOST)
 
     def makeHTTPRequest(
         self,
@@ -785,41 +933,24 @@ class SIM800L(object):
         contentType: str = "application/json",
     ) -> Response:
         """Make HTTP GET or POST request. NOTE: Initiale HTTP before making a request."""
-        if not self.HTTPinitialized:
-            raise Exception("HTTP service is not initialized")
-
-        # Set url
-        self.execute(Commands.setHTTPParameterURL(url))
-
         if method == "GET":
-            # GET
-            output = self.execute(Commands.HTTPActionGET())
-        elif method == "POST":
-            # Send data
-            self.execute(Commands.setHTTPParameterContent(contentType))
-            self.execute(Commands.HTTPData(len(data)))
-            self.execute(Commands.dumpData(data))
-            # POST
-            output = self.execute(Commands.HTTPActionPOST())
-        else:
-            raise Exception(f'Unsupported HTTP method "{method}"')
-
-        return Response(
-            status_code=output.split(",")[1],
-            content=self.execute(Commands.HTTPRead(), clean_output=False),
-        )
+            return self.httpGet(url)
+        if method == "POST":
+            return self.httpPost(url, data, contentType)
+
+        raise Exception(f'Unsupported HTTP method "{method}"')
 
     def enableSSL(self):
         """Enable SSL"""
         if not self.sslSupported:
             raise Exception("SSL is not supported by this modem")
-        self.execute(Commands.setSSL(1))
+        self.execute(Commands.enableSSL)
 
     def disableSSL(self):
         """Disable SSL"""
         if not self.sslSupported:
             raise Exception("SSL is not supported by this modem")
-        self.execute(Commands.setSSL(0))
+        self.execute(Commands.disableSSL)
 
     def init_tcp(self, domain: str, port: int):
         """Initialize TCP connection"""
@@ -827,11 +958,11 @@ class SIM800L(object):
 
     def close_tcp(self) -> None:
         """Close TCP connection"""
-        self.execute(Commands.closeTcp())
+        self.execute(Commands.closeTcp)
 
     def send_tcp_data(self, data: bytes) -> None:
         """Send TCP data"""
-        self.execute(Commands.sendTcpSendHeader())
+        self.execute(Commands.sendTcpSendHeader)
         self.execute(Commands.sendTcpDataBytes(data))
 
 
@@ -11,12 +11,10 @@ class env:
     mqtt_pass: str = "pass"
     mqtt_keep_alive: int = 60
 
-    connection_payload: bytes = None
-
-    def __init__(self):
-        self.connection_payload = (
-            create_connect_packet(self.id, self.mqtt_keep_alive) + b"\x1A"
-        )
+    # Built once when the class is created, every field it depends on is a constant
+    connection_payload: bytes = bytes(
+        create_connect_packet(id, mqtt_keep_alive) + b"\x1A"
+    )
 
 
 if __name__ == "__main__":
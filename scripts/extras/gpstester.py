@@ -1,3 +1,4 @@
+import time
 from NMEA import NMEAparser
 from hardware import Hardware
 
@@ -14,8 +15,11 @@ gpsModule = Hardware.gps()
 gpsParserObject = NMEAparser()
 
 while True:
-    if gpsModule.any():
+    # Read whatever has arrived in one go instead of one byte per read
+    if waiting := gpsModule.any():
         try:
-            print((gpsModule.read(1)).decode("ASCII"), end="")
+            print(gpsModule.read(waiting).decode("ASCII"), end="")
         except Exception as e:
             print("GPS Exception", e)
+    else:
+        time.sleep_ms(10)
@@ -47,7 +47,7 @@ print("Gsm loc:", simModule.getGsmLocation())
 print("\n", simModule.getCellTowerInfo(), "\n")
 
 try:
-    simModule.execute(Commands.closeTcp())
+    simModule.execute(Commands.closeTcp)
 except Exception as e:
     print(e)
 
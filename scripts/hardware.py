@@ -2,51 +2,71 @@ from machine import Pin, UART, I2C
 
 
 class Hardware:
-    @staticmethod
-    def gps():
-        return UART(
-            1,
-            tx=Pin(8),
-            rx=Pin(9),
-            baudrate=9600,
-        )
-
-    @staticmethod
-    def sim():
-        return UART(
-            0,
-            tx=Pin(0),
-            rx=Pin(1),
-            baudrate=9600,
-        )
-
-    @staticmethod
-    def sim_rst():
-        return Pin(2, Pin.OUT)
-
-    @staticmethod
-    def oled():
-        return I2C(
-            1,
-            scl=Pin(19),
-            sda=Pin(18),
-            freq=200000,
-        )
+    # Peripherals are created on first use and then reused, so asking for one again doesn't reconfigure it
+    _gps: UART | None = None
+    _sim: UART | None = None
+    _sim_rst: Pin | None = None
+    _oled: I2C | None = None
+    _imu: I2C | None = None
+    _led: Pin | None = None
+
+    @classmethod
+    def gps(cls):
+        if cls._gps is None:
+            cls._gps = UART(
+                1,
+                tx=Pin(8),
+                rx=Pin(9),
+                baudrate=9600,
+            )
+        return cls._gps
+
+    @classmethod
+    def sim(cls):
+        if cls._sim is None:
+            cls._sim = UART(
+                0,
+                tx=Pin(0),
+                rx=Pin(1),
+                baudrate=9600,
+            )
+        return cls._sim
+
+    @classmethod
+    def sim_rst(cls):
+        if cls._sim_rst is None:
+            cls._sim_rst = Pin(2, Pin.OUT)
+        return cls._sim_rst
+
+    @classmethod
+    def oled(cls):
+        if cls._oled is None:
+            cls._oled = I2C(
+                1,
+                scl=Pin(19),
+                sda=Pin(18),
+                freq=400000,  # SSD1306 fast mode limit, twice as fast to flush a frame
+            )
+        return cls._oled
 
     oled_resolution = (128, 32)
 
-    @staticmethod
-    def imu():
-        return I2C(
-            0,
-            scl=Pin(17),
-            sda=Pin(16),
-            freq=400000,
-        )
-
-    @staticmethod
-    def led():
-        return Pin(25, Pin.OUT)
+    @classmethod
+    def imu(cls):
+        if cls._imu is None:
+            cls._imu = I2C(
+                0,
+                scl=Pin(17),
+                sda=Pin(16),
+                freq=400000,
+            )
+        return cls._imu
+
+    @classmethod
+    def led(cls):
+        if cls._led is None:
+            cls._led = Pin(25, Pin.OUT)
+        return cls._led
 
 
 if __name__ == "__main__":
@@ -1,14 +1,50 @@
 import re
+import select
 from env import env
-from mqtt import create_publish_packet
+from mqtt import create_publish_template, write_remaining_length
 import time
-from machine import Pin, UART, reset
+from machine import Pin, UART, Timer, reset
 from NMEA import NMEAparser
 from OLED import SSD1306_I2C
 import _thread
+import micropython
+from micropython import const
 from hardware import Hardware
 from SIM800L import SIM800L
 
+# Status texts shown on every GPS update without a fix, kept as constants so nothing is built per call
+GPS_NO_FIX = "GPS: No Location Fix"
+GPS_NO_TIME = "GPS: No Time Fix"
+
+# Size of the reusable MQTT publish buffer, a location message is well under this
+MAX_PUBLISH_SIZE = 256
+
+# Size of the reusable GPS read buffer, whatever doesn't fit is read on the next pass
+GPS_READ_SIZE = 256
+
+# Pause between GPS reads during a burst, ~20 bytes arrive at 9600 baud and the UART RX buffer holds far more
+GPS_READ_INTERVAL_MS = 20
+
+# display() overflow behaviours, ints so checking them is an int compare
+OVERFLOW_EOL = const(0)
+OVERFLOW_WRAP = const(1)
+
+# Pause between two queued LED blink codes so they can be told apart
+BLINK_GAP_MS = 600
+
+# Minimum time between two "Time Delta" updates on the OLED
+TIME_DELTA_INTERVAL_MS = 2000
+
+
+def coordinateText(value: float) -> str:
+    """
+    Format a coordinate with 6 decimals (~0.1 m) from a scaled int,
+    %d on small ints is a lot cheaper than str() of a float
+    """
+    scaled = int(value * 1000000 + (0.5 if value >= 0 else -0.5))
+    degrees, micro = divmod(-scaled if scaled < 0 else scaled, 1000000)
+    return "%s%d.%06d" % ("-" if scaled < 0 else "", degrees, micro)
+
 
 class Tracker(object):
     """
@@ -16,7 +52,10 @@ class Tracker(object):
     """
 
     oled: SSD1306_I2C | None = None
-    picoLed: Pin
+    picoLed: Pin | None = None
+    blinkTimer: Timer | None = None
+    blinkToggles: int = 0
+    blinking: bool = False
     simModule: SIM800L
     gpsModule: UART
     gpsParserObject: NMEAparser
@@ -27,14 +66,31 @@ class Tracker(object):
     # Threading and locks
     sharedData: str = ""
     sharedDataLock = _thread.allocate_lock()
+    # Held while there is no new data, gpsThread releases it to wake up networkingThread
+    dataReady = _thread.allocate_lock()
 
     def __init__(self) -> None:
         self.env = env()
+        # Blink codes waiting for the one that is running to finish, as (times, delay)
+        self.blinkQueue: list = []
+        self.dataReady.acquire()
+
+        # Publish header byte and framed topic never change, build them once
+        self.publishHeader, self.publishTopic = create_publish_template(
+            topic=self.env.mqtt_topic,
+            retain=True,
+        )
+        # Every publish is written into this one buffer and sent through a view of it
+        self.publishBuffer = bytearray(MAX_PUBLISH_SIZE)
+        self.publishView = memoryview(self.publishBuffer)
 
         self.__connectLED()
         self.__connectOLED()
-        assert self.__connectSIMmodule(), "SIM Module Connection Error"
-        assert self.__connectGPSmodule(), "GPS Module Connection Error"
+        # Explicit checks instead of asserts, mpy-cross -O3 strips asserts
+        if not self.__connectSIMmodule():
+            raise RuntimeError("SIM Module Connection Error")
+        if not self.__connectGPSmodule():
+            raise RuntimeError("GPS Module Connection Error")
 
         # Get battery status from SIM Module
         battChargeStatus, battLevel, battVoltage = self.simModule.batteryStatus()
@@ -52,16 +108,29 @@ class Tracker(object):
         self.simModule.reset()
         reset()
 
+    def __peripheralStatus(
+        self, name: str, error: Exception | None = None, wait: bool = False
+    ) -> None:
+        """
+        Show if a peripheral connected, blink 2 times if it did and 5 times if it didn't
+        """
+        if error is None:
+            self.display(f"{name}: OK")
+            self.ledBlink(2, 0.1, wait)
+        else:
+            self.display(f"{name}: ERROR")
+            print(error)
+            self.ledBlink(5, 0.1, wait)
+
     def __connectLED(self) -> None:
         try:
             self.picoLed = Hardware.led()
 
         except Exception as e:
-            print("LED: ERROR")
-            print(e)
+            self.__peripheralStatus("LED", e)
 
         else:
-            print("LED: OK")
+            self.__peripheralStatus("LED")
 
     def __connectOLED(self) -> None:
         try:
@@ -72,13 +141,10 @@ class Tracker(object):
             )
 
         except Exception as e:
-            print("OLED: ERROR")
-            print(e)
-            self.ledBlink(5, 0.1)
+            self.__peripheralStatus("OLED", e)
 
         else:
-            print("OLED: OK")
-            self.ledBlink(2, 0.1)
+            self.__peripheralStatus("OLED")
 
     def __connectSIMmodule(self) -> bool:
         try:
@@ -87,17 +153,15 @@ class Tracker(object):
                 Hardware.sim_rst(),
                 True,
             )
-            assert self.simModule.initialize()
+            if not self.simModule.initialize():
+                raise RuntimeError("SIM Module Initialisation Error")
 
         except Exception as e:
-            self.display("SIM: ERROR")
-            print(e)
-            self.ledBlink(5, 0.1)
+            self.__peripheralStatus("SIM", e)
             return False
 
         else:
-            self.display("SIM: OK")
-            self.ledBlink(2, 0.1)
+            self.__peripheralStatus("SIM")
             return True
 
     def __connectGPSmodule(self) -> bool:
@@ -105,15 +169,12 @@ class Tracker(object):
             self.gpsModule = Hardware.gps()
 
         except Exception as e:
-            self.display("GPS: ERROR")
-            print(e)
-            self.ledBlink(5, 0.1)
+            self.__peripheralStatus("GPS", e, wait=True)
             self.hardReset()
             return False
 
         else:
-            self.display("GPS: OK")
-            self.ledBlink(2, 0.1)
+            self.__peripheralStatus("GPS")
             self.gpsParserObject = NMEAparser()
             return True
 
@@ -134,9 +195,10 @@ class Tracker(object):
         )
         self.checkNetworkRegistered()
 
-        tires: int = 1
+        # Retry quickly on a transient failure, back off up to 5 s if it keeps failing
+        delay: int = 100
 
-        while tires < 11:
+        for tries in range(1, 11):
             try:
                 ip = self.simModule.connectGPRS()
                 self.getSignalStrength()
@@ -145,50 +207,113 @@ class Tracker(object):
                 return
 
             except Exception as e:
-                tires += 1
-                self.display(f"\nConnection failed\ntry: {tires}/10")
+                self.display(f"\nConnection failed\ntry: {tries}/10")
                 print(f"Internet Connection Exception: {e}")
-                time.sleep(1)
+                time.sleep_ms(delay)
+                delay = min(delay * 2, 5000)
 
         self.hardReset()
 
-    def ledBlink(self, times: int = 1, delay: float = 1) -> None:
+    def ledBlink(self, times: int = 1, delay: float = 1, wait: bool = False) -> None:
+        """
+        Blink the LED, the toggles run on a timer so the caller isn't blocked unless wait is set
+        (e.g. right before a reset). A blink started while another one runs is queued after it
+        """
         if self.picoLed:
-            self.picoLed.value(0)  # turn off led if open
-            for _ in range(times * 2 - 1):
-                self.picoLed.toggle()
-                time.sleep(delay)
-            self.picoLed.value(0)  # turn off led if somehow left on
+            if wait:
+                # Let the queued blink codes finish first so none of them is cut off
+                while self.blinking:
+                    time.sleep_ms(10)
+
+                self.picoLed.value(0)  # turn off led if open
+                for _ in range(times * 2 - 1):
+                    self.picoLed.toggle()
+                    time.sleep(delay)
+                self.picoLed.value(0)  # turn off led if somehow left on
+                return
+
+            self.blinkQueue.append((times, delay))
+            if not self.blinking:
+                self.__startNextBlink()
+
+    def __startNextBlink(self, timer: Timer | None = None) -> None:
+        times, delay = self.blinkQueue.pop(0)
+        self.blinking = True
+
+        self.picoLed.value(0)  # turn off led if open
+        self.picoLed.toggle()
+        self.blinkToggles = times * 2 - 2
+        if self.blinkTimer is None:
+            self.blinkTimer = Timer()
+        self.blinkTimer.init(
+            mode=Timer.PERIODIC,
+            period=int(delay * 1000),
+            callback=self.__blinkStep,
+        )
+
+    def __blinkStep(self, timer: Timer) -> None:
+        if self.blinkToggles > 0:
+            self.picoLed.toggle()
+            self.blinkToggles -= 1
+            return
+
+        timer.deinit()
+        self.picoLed.value(0)  # turn off led if somehow left on
 
+        if self.blinkQueue:
+            timer.init(
+                mode=Timer.ONE_SHOT,
+                period=BLINK_GAP_MS,
+                callback=self.__startNextBlink,
+            )
+        else:
+            self.blinking = False
+
+    @micropython.native
     def display(
-        self, text: str, x: int = 0, y: int = 0, color: int = 1, overflow: str = "wrap"
+        self,
+        text: str,
+        x: int = 0,
+        y: int = 0,
+        color: int = 1,
+        overflow: int = OVERFLOW_WRAP,
     ) -> None:
         """
         Display text on OLED screen
 
         Overflow Behaviours
-        eol : chop the sentance
-        wrap : wrap to next line
+        OVERFLOW_EOL : chop the sentance
+        OVERFLOW_WRAP : wrap to next line
         """
 
         try:
-            if self.lastDisplayedText != text:
+            # Same object as last time means nothing changed, skip the string compare
+            if text is not self.lastDisplayedText and self.lastDisplayedText != text:
                 print("\n" + text)
                 if self.oled:
                     self.oled.fill(0)
-                    lines = text.splitlines()
-                    for index in range(4):
-                        if index < len(lines):
-                            line = lines[index]
-                            if len(line) > 16:
-                                if overflow == "eol":
-                                    line = line[:16]
-                                else:
-                                    lines.insert(index + 1, line[16:])
-                                    line = line[:16]
-                            self.oled.text(line.strip(), x, y, 1)
+                    # Draw up to 4 rows of 16 chars, long lines are cut or wrapped in 16 char steps. Lines are
+                    # found with find() so only the drawn rows are sliced out of text, no list of lines is built
+                    rows = 0
+                    pos = 0
+                    length = len(text)
+                    while rows < 4 and pos < length:
+                        line_end = text.find("\n", pos)
+                        if line_end < 0:
+                            line_end = length
+                        start = pos
+                        while rows < 4:
+                            self.oled.text(
+                                text[start : min(start + 16, line_end)].strip(), x, y, 1
+                            )
                             y += 8
-                            self.oled.show()
+                            rows += 1
+                            start += 16
+                            if overflow == OVERFLOW_EOL or start >= line_end:
+                                break
+                        pos = line_end + 1
+                    # Send the frame to the screen once all rows are drawn
+                    self.oled.show()
                     self.lastDisplayedText = text
         except Exception as e:
             print("Display exception", e)
@@ -263,15 +388,24 @@ class Tracker(object):
         self.hardReset()
 
     def makeMqttRequest(self, data: str) -> None:
-        payload = (
-            create_publish_packet(
-                topic=self.env.mqtt_topic,
-                message=data,
-                retain=True,
-            )
-            + b"\x1A"
-        )
-        self.simModule.send_tcp_data(payload)
+        message: bytes = data.encode()
+        topic: bytes = self.publishTopic
+        buffer: bytearray = self.publishBuffer
+
+        # Header byte, Remaining Length (at most 3 bytes here), topic, message and Ctrl+Z to end the send
+        if 1 + 3 + len(topic) + len(message) + 1 > MAX_PUBLISH_SIZE:
+            raise ValueError("Mqtt message too large")
+
+        buffer[0] = self.publishHeader[0]
+        size = write_remaining_length(buffer, 1, len(topic) + len(message))
+        buffer[size : size + len(topic)] = topic
+        size += len(topic)
+        buffer[size : size + len(message)] = message
+        size += len(message)
+        buffer[size] = 0x1A
+        size += 1
+
+        self.simModule.send_tcp_data(self.publishView[:size])
 
     # Networking Thread
     def networkingThread(self) -> None:
@@ -281,6 +415,7 @@ class Tracker(object):
         self.connectMqttServer()
         currentData: str = ""
         lastData: str = ""
+        lastTimeDeltaShown: int = time.ticks_ms()
 
         failedRequests: int = 0
 
@@ -291,7 +426,7 @@ class Tracker(object):
             self.sharedDataLock.release()
 
             if currentData and currentData != lastData:
-                self.display(f"\nSending Location")
+                self.display("\nSending Location")
                 print("Data =", currentData)
 
                 self.picoLed.value(1)
@@ -307,47 +442,87 @@ class Tracker(object):
                 else:
                     t2: int = time.ticks_ms()
                     self.picoLed.value(0)
-                    self.display(f"Time Delta:\n{time.ticks_diff(t2,t1)/1000} s")
+                    # Formatting and redrawing on every publish costs more I2C time than it's worth
+                    if time.ticks_diff(t2, lastTimeDeltaShown) > TIME_DELTA_INTERVAL_MS:
+                        self.display(f"Time Delta:\n{time.ticks_diff(t2,t1)/1000} s")
+                        lastTimeDeltaShown = t2
                     lastData = currentData
                     failedRequests = 0
+            else:
+                # Nothing new to send, block until gpsThread signals new data instead of spinning on the lock
+                self.dataReady.acquire()
 
         print("Too many failed requests, resetting...")
         self.hardReset()
 
     # GPS Thread
+    @micropython.native
     def gpsThread(self) -> None:
         """
         GPS Thread that handels reading and parsing GPS data
         """
         lastDataString: str = ""
         dataString: str = ""
+        lastFix: tuple = ()
+        # Last GPS status shown by this thread, "" once there is a fix
+        lastStatus: str = ""
+        gpsParserObject: NMEAparser = self.gpsParserObject
+
+        # Lets the thread sleep until the GPS sends something instead of waking up every few ms
+        poller = select.poll()
+        poller.register(self.gpsModule, select.POLLIN)
+
+        # UART reads go into this one buffer instead of a new bytes object per read
+        gpsBuffer = bytearray(GPS_READ_SIZE)
 
         while self.gpsModule:
-            if data := self.gpsModule.read(1):
+            if size := self.gpsModule.readinto(gpsBuffer):
                 try:
-                    if self.gpsParserObject.update(data.decode("ASCII")):
-                        if self.gpsParserObject.utc_time:
-                            if self.gpsParserObject.lat and self.gpsParserObject.lng:
-                                dataString = (
-                                    str(self.gpsParserObject.lat)
-                                    + ","
-                                    + str(self.gpsParserObject.lng)
-                                    + ","
-                                    + str(self.gpsParserObject.utc_time)
+                    if gpsParserObject.update_bytes(gpsBuffer, size):
+                        if gpsParserObject.utc_time:
+                            if gpsParserObject.lat and gpsParserObject.lng:
+                                # Only format the data string again when the fix changed
+                                fix = (
+                                    gpsParserObject.lat,
+                                    gpsParserObject.lng,
+                                    gpsParserObject.utc_time,
                                 )
-                            else:
-                                self.display("GPS: No Location Fix")
-                        else:
-                            self.display("GPS: No Time Fix")
+                                if fix != lastFix:
+                                    dataString = "%s,%s,%s" % (
+                                        coordinateText(fix[0]),
+                                        coordinateText(fix[1]),
+                                        fix[2],
+                                    )
+                                    lastFix = fix
+                                lastStatus = ""
+                            # Only call display() when the status changed, not on every sentence without a fix
+                            elif lastStatus is not GPS_NO_FIX:
+                                self.display(GPS_NO_FIX)
+                                lastStatus = GPS_NO_FIX
+                        elif lastStatus is not GPS_NO_TIME:
+                            self.display(GPS_NO_TIME)
+                            lastStatus = GPS_NO_TIME
 
                 except Exception as e:
                     print("GPS Exception", e)
 
+                # Buffer wasn't filled, let more of the burst collect before the next read instead of reading
+                # it a few bytes at a time
+                if size < GPS_READ_SIZE:
+                    time.sleep_ms(GPS_READ_INTERVAL_MS)
+            else:
+                # Nothing received, block until the next burst starts (timeout so the loop condition is
+                # rechecked), then let the UART fill up for a bit so it's read in one chunk
+                if poller.poll(1000):
+                    time.sleep_ms(GPS_READ_INTERVAL_MS)
+
             if dataString and dataString != lastDataString:
                 self.sharedDataLock.acquire()
                 self.sharedData = dataString
                 self.sharedDataLock.release()
                 lastDataString = dataString
+                if self.dataReady.locked():
+                    self.dataReady.release()
 
     def start(self) -> None:
         """
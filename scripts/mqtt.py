@@ -1,54 +1,88 @@
 import struct
 
+# Variable Header of the Connect Packet: Protocol Name (MQTT), Protocol Level (4 = MQTT 3.1.1) and Connect Flags
+# (Clean session). All constant, so they are packed once here
+CONNECT_VARIABLE_HEADER: bytes = b"\x00\x04MQTT" + struct.pack("!BB", 4, 0x02)
+
+
+def create_connect_packet(client_id: str, keep_alive_duration: int = 60) -> bytearray:
+    client_id_bytes: bytes = client_id.encode()
+    variable_header_len: int = len(CONNECT_VARIABLE_HEADER)
+    remaining_length: int = variable_header_len + 4 + len(client_id_bytes)
+
+    # Whole packet is packed into one buffer instead of concatenating its parts
+    packet = bytearray(1 + remaining_length_size(remaining_length) + remaining_length)
 
-def create_connect_packet(client_id: str, keep_alive_duration: int = 60) -> bytes:
     # Fixed Header: Connect command (0x10) and Remaining Length
-    fixed_header: bytes = struct.pack("!BB", 0x10, 12 + len(client_id))
+    packet[0] = 0x10
+    offset: int = write_remaining_length(packet, 1, remaining_length)
 
-    # Variable Header: Protocol Name (MQTT), Protocol Level (4), Connect Flags, Keep Alive
-    protocol_name: bytes = b"\x00\x04MQTT"
-    protocol_level: bytes = struct.pack("!B", 4)  # Protocol level 4 (MQTT 3.1.1)
-    connect_flags: bytes = struct.pack("!B", 0x02)  # Connect flags (Clean session)
-    keep_alive: bytes = struct.pack("!H", keep_alive_duration)  # Keep alive
+    # Variable Header: the constant part
+    packet[offset : offset + variable_header_len] = CONNECT_VARIABLE_HEADER
+    offset += variable_header_len
 
-    # Payload: Client Identifier
-    client_id_len: bytes = struct.pack("!H", len(client_id))
-    client_id_bytes: bytes = client_id.encode()
+    # Keep Alive, then the Payload: Client Identifier length and the Client Identifier
+    struct.pack_into("!HH", packet, offset, keep_alive_duration, len(client_id_bytes))
+    packet[offset + 4 :] = client_id_bytes
+    return packet
+
+
+def create_publish_packet(
+    topic: str, message: str, qos: int = 0, retain: bool = False
+) -> bytearray:
+    # Variable Header: Topic Name and Payload: Message (both UTF-8 encoded)
+    topic_bytes: bytes = topic.encode("utf-8")
+    message_bytes: bytes = message.encode("utf-8")
 
-    # Combine all parts to form the Connect Packet
-    connect_packet: bytes = (
-        fixed_header
-        + protocol_name
-        + protocol_level
-        + connect_flags
-        + keep_alive
-        + client_id_len
-        + client_id_bytes
-    )
-    return connect_packet
-
-
-def create_publish_packet(topic: str, message: str, qos: int = 0, retain: bool = False):
-    # Fixed Header: Publish command (0x30), Retain flag, QoS, and Remaining Length
+    # Remaining Length: 2 bytes for the topic length + length of topic + length of message
+    remaining_length: int = 2 + len(topic_bytes) + len(message_bytes)
+
+    # Whole packet is packed into one buffer instead of concatenating its parts
+    packet = bytearray(1 + remaining_length_size(remaining_length) + remaining_length)
+
+    # Fixed Header: Publish command (0x30), QoS, Retain flag (LSB) and Remaining Length
     retain_flag = 1 if retain else 0
-    fixed_header_byte = 0x30 | (qos << 1) | retain_flag  # Set retain flag (LSB)
-    fixed_header = struct.pack("!B", fixed_header_byte)
+    packet[0] = 0x30 | (qos << 1) | retain_flag
+    offset: int = write_remaining_length(packet, 1, remaining_length)
+
+    # Topic length and Topic Name, then the Message
+    struct.pack_into("!H", packet, offset, len(topic_bytes))
+    topic_end: int = offset + 2 + len(topic_bytes)
+    packet[offset + 2 : topic_end] = topic_bytes
+    packet[topic_end:] = message_bytes
+    return packet
+
 
-    # Variable Header: Topic Name (ensure it's properly encoded)
-    topic_len = struct.pack("!H", len(topic))  # 2 bytes for topic length
-    topic_bytes = topic.encode("utf-8")  # Topic should be UTF-8 encoded
+def remaining_length_size(length: int) -> int:
+    # Number of bytes the Remaining Length takes, 7 bits of the length per byte
+    size = 1
+    while length >= 128:
+        length //= 128
+        size += 1
+    return size
+
+
+def create_publish_template(topic: str, qos: int = 0, retain: bool = False) -> tuple:
+    # The fixed header byte and the framed topic (length + name) are the same for every message on a topic,
+    # so they are built once and only the Remaining Length and the message are added per publish
+    retain_flag = 1 if retain else 0
+    fixed_header_byte: bytes = struct.pack("!B", 0x30 | (qos << 1) | retain_flag)
 
-    # Payload: Message (also encoded as UTF-8)
-    message_bytes = message.encode("utf-8")
+    topic_bytes: bytes = topic.encode("utf-8")
+    topic_framed: bytes = struct.pack("!H", len(topic_bytes)) + topic_bytes
 
-    # Remaining Length calculation: 2 bytes for topic length + length of topic + length of message
-    remaining_length = (
-        len(topic_bytes) + len(message_bytes) + 2
-    )  # 2 bytes for the topic length
+    return fixed_header_byte, topic_framed
 
-    # Fixed header + remaining length byte
-    fixed_header += struct.pack("!B", remaining_length)
 
-    # Combine all parts to form the Publish Packet
-    publish_packet = fixed_header + topic_len + topic_bytes + message_bytes
-    return publish_packet
+def write_remaining_length(buffer, offset: int, length: int) -> int:
+    # Remaining Length: 7 bits per byte, continuation bit (0x80) set on every byte but the last. Written
+    # straight into buffer, returns the offset after it
+    while True:
+        byte = length % 128
+        length //= 128
+        if length:
+            byte |= 0x80
+        buffer[offset] = byte
+        offset += 1
+        if not length:
+            return offset